@@ -1,190 +1,362 @@
+import argparse
 import asyncio
+import hashlib
 import json
+import os
 
 from google import genai
 from google.genai import types
 from fastmcp import Client
 
 REMOTE_SERVER_URL = "http://localhost:8000/mcp"
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "intake-mcp")
+
+# process-wide Gemini client + system prompts, built once and reused per intake
+_gemini = None
+_system_contents = {}
+
+
+def get_gemini():
+    # created on first use so a missing API key surfaces inside main()'s error handling
+    global _gemini
+    if _gemini is None:
+        _gemini = genai.Client()
+    return _gemini
+
+
+_DECODER = json.JSONDecoder()
 
 
 def safe_json_load(text: str):
+    """
+    Decodes the first JSON object in text, in place: markdown fences
+    or chatter before/after the object are simply skipped.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
     try:
-        text = text.strip()
+        obj, _ = _DECODER.raw_decode(text, start)
+        return obj
+    except ValueError:
+        return None
+
+
+def config_cache_path(server_url: str) -> str:
+    name = hashlib.sha256(server_url.encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{name}.json")
 
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1]
-            text = text.rsplit("```", 1)[0].strip()
 
-        return json.loads(text)
+def load_cached_config(server_url: str, version: str):
+    """
+    Returns (taxonomy, severity, routing) text saved for this server,
+    or None if nothing is cached or the server config changed since.
+    """
+    try:
+        with open(config_cache_path(server_url), "r") as f:
+            cached = json.load(f)
+        if not version or cached.get("version") != version:
+            return None
+        return cached["taxonomy"], cached["severity"], cached["routing"]
     except Exception:
         return None
 
 
-async def main():
-    user_prompt = input("Enter request / intake text: ")
+def save_cached_config(server_url: str, version: str, taxonomy: str, severity: str, routing: str):
+    if not version:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(config_cache_path(server_url), "w") as f:
+            json.dump(
+                {"version": version, "taxonomy": taxonomy, "severity": severity, "routing": routing},
+                f
+            )
+    except Exception as e:
+        print(f"⚠️ Could not write config cache: {e}")
+
 
-    gemini = genai.Client()
-    mcp_client = Client(REMOTE_SERVER_URL)
+async def fetch_config_texts(mcp_client: Client):
+    print("\n📌 Fetching config resources from MCP server...\n")
 
+    # cheap version probe; older servers may not expose it
     try:
-        async with mcp_client:
-            await mcp_client.initialize()
+        version_res = await mcp_client.read_resource("config://version")
+        config_version = version_res[0].text if version_res else ""
+    except Exception:
+        config_version = ""
+
+    cached = load_cached_config(REMOTE_SERVER_URL, config_version)
+    if cached:
+        taxonomy_text, severity_text, routing_text = cached
+        print("✅ Config unchanged, using local cache")
+    else:
+        # independent reads -> one round-trip instead of three
+        taxonomy_res, severity_res, routing_res = await asyncio.gather(
+            mcp_client.read_resource("config://taxonomy"),
+            mcp_client.read_resource("config://severity_rules"),
+            mcp_client.read_resource("config://routing"),
+        )
+
+        taxonomy_text = taxonomy_res[0].text if taxonomy_res else ""
+        severity_text = severity_res[0].text if severity_res else ""
+        routing_text = routing_res[0].text if routing_res else ""
+
+        save_cached_config(
+            REMOTE_SERVER_URL, config_version, taxonomy_text, severity_text, routing_text
+        )
+
+    print("✅ Taxonomy loaded")
+    print("✅ Severity rules loaded")
+    print("✅ Routing rules loaded")
+
+    return taxonomy_text, severity_text, routing_text
+
+
+def get_system_content(taxonomy_text: str, severity_text: str, routing_text: str):
+    key = (taxonomy_text, severity_text, routing_text)
+    if key not in _system_contents:
+        _system_contents.clear()  # only the latest config is ever needed
+        _system_contents[key] = build_system_content(*key)
+    return _system_contents[key]
+
+
+# --------------------------------------------------
+# Strong system prompt for tool flow
+# --------------------------------------------------
+def build_system_content(taxonomy_text: str, severity_text: str, routing_text: str):
+    return types.Content(
+        role="user",
+        parts=[
+            types.Part(
+                text=(
+                    "You are an Intelligent Intake and Triage assistant.\n"
+                    "You MUST use MCP tools to triage.\n\n"
+                    "TOOLS AVAILABLE:\n"
+                    "- triage_intake(text)\n"
+                    "- classify_intake(text)\n"
+                    "- score_severity(text, category)\n"
+                    "- route_case(category, score)\n\n"
+                    "RULES:\n"
+                    "1) ALWAYS call triage_intake(text) first.\n"
+                    "2) If triage_intake returns needs_llm=true, then:\n"
+                    "   a) Choose the best category yourself using taxonomy\n"
+                    "   b) Call score_severity(text, category)\n"
+                    "   c) Call route_case(category, score)\n"
+                    "3) FINAL output MUST be JSON exactly in this format:\n\n"
+                    "{\n"
+                    '  "needs_llm": true,\n'
+                    '  "llm_decision": {\n'
+                    '    "selected_category": "...",\n'
+                    '    "reason": "..."\n'
+                    "  },\n"
+                    '  "category": "...",\n'
+                    '  "severity_level": "...",\n'
+                    '  "severity_score": 0,\n'
+                    '  "priority": "...",\n'
+                    '  "destination": "...",\n'
+                    '  "reason": "..."\n'
+                    "}\n\n"
+                    "IMPORTANT:\n"
+                    "- If triage_intake returns needs_llm=false, then:\n"
+                    "  - set needs_llm=false\n"
+                    "  - set llm_decision=null\n\n"
+                    "CONFIG RESOURCES (REFERENCE ONLY):\n"
+                    f"Taxonomy:\n{taxonomy_text}\n\n"
+                    f"Severity Rules:\n{severity_text}\n\n"
+                    f"Routing Rules:\n{routing_text}\n\n"
+                    "Now triage the user intake."
+                )
+            )
+        ]
+    )
+
+
+def print_triage_result(parsed: dict):
+    print("\n🟢 Final Triage Result (Formatted):\n")
+    print("====================================")
+    print(f"📌 Category      : {parsed.get('category')}")
+    print(f"🔥 Severity      : {parsed.get('severity_level')}")
+    print(f"📊 Score         : {parsed.get('severity_score')}")
+    print(f"⚡ Priority      : {parsed.get('priority')}")
+    print(f"🏥 Destination   : {parsed.get('destination')}")
+    print(f"📝 Reason        : {parsed.get('reason')}")
+    print("====================================\n")
+
+    # ✅ EXTRA: Print what LLM decided (ONLY if needs_llm=True)
+    if parsed.get("needs_llm") is True:
+        llm_decision = parsed.get("llm_decision") or {}
+        print("------------------------------------")
+        print(f"✅ Selected Category : {llm_decision.get('selected_category')}")
+        print(f"📝 LLM Reason        : {llm_decision.get('reason')}")
+        print("------------------------------------\n")
+
+
+async def stream_gemini_turn(gemini, history: list, gemini_tools: list):
+    """
+    Streams one model turn. Stops reading as soon as the text holds a
+    complete JSON object, instead of waiting for the whole generation.
+    Returns (text, parsed JSON or None, function calls).
+    """
+    stream = await gemini.aio.models.generate_content_stream(
+        model="gemini-2.5-flash",
+        contents=history,
+        config=types.GenerateContentConfig(tools=gemini_tools)
+    )
+
+    text = ""
+    depth = 0
+    parsed = None
+    function_calls = []
 
-            print("\n📌 Fetching config resources from MCP server...\n")
+    try:
+        async for chunk in stream:
+            if chunk.function_calls:
+                function_calls.extend(chunk.function_calls)
+
+            piece = chunk.text
+            if not piece:
+                continue
+
+            text += piece
+            # cheap brace counter: only try to decode once the braces balance
+            depth += piece.count("{") - piece.count("}")
+            if depth <= 0 and "}" in piece:
+                parsed = safe_json_load(text)
+                if parsed:
+                    break
+    finally:
+        # release the HTTP stream right away when we stop early
+        await stream.aclose()
 
-            taxonomy_res = await mcp_client.read_resource("config://taxonomy")
-            severity_res = await mcp_client.read_resource("config://severity_rules")
-            routing_res = await mcp_client.read_resource("config://routing")
+    if parsed is None and text:
+        parsed = safe_json_load(text)
 
-            taxonomy_text = taxonomy_res[0].text if taxonomy_res else ""
-            severity_text = severity_res[0].text if severity_res else ""
-            routing_text = routing_res[0].text if routing_res else ""
+    return text, parsed, function_calls
 
-            print("✅ Taxonomy loaded")
-            print("✅ Severity rules loaded")
-            print("✅ Routing rules loaded")
 
-            # --------------------------------------------------
-            # Strong system prompt for tool flow
-            # --------------------------------------------------
-            history = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part(
-                            text=(
-                                "You are an Intelligent Intake and Triage assistant.\n"
-                                "You MUST use MCP tools to triage.\n\n"
-                                "TOOLS AVAILABLE:\n"
-                                "- triage_intake(text)\n"
-                                "- classify_intake(text)\n"
-                                "- score_severity(text, category)\n"
-                                "- route_case(category, score)\n\n"
-                                "RULES:\n"
-                                "1) ALWAYS call triage_intake(text) first.\n"
-                                "2) If triage_intake returns needs_llm=true, then:\n"
-                                "   a) Choose the best category yourself using taxonomy\n"
-                                "   b) Call score_severity(text, category)\n"
-                                "   c) Call route_case(category, score)\n"
-                                "3) FINAL output MUST be JSON exactly in this format:\n\n"
-                                "{\n"
-                                '  "needs_llm": true,\n'
-                                '  "llm_decision": {\n'
-                                '    "selected_category": "...",\n'
-                                '    "reason": "..."\n'
-                                "  },\n"
-                                '  "category": "...",\n'
-                                '  "severity_level": "...",\n'
-                                '  "severity_score": 0,\n'
-                                '  "priority": "...",\n'
-                                '  "destination": "...",\n'
-                                '  "reason": "..."\n'
-                                "}\n\n"
-                                "IMPORTANT:\n"
-                                "- If triage_intake returns needs_llm=false, then:\n"
-                                "  - set needs_llm=false\n"
-                                "  - set llm_decision=null\n\n"
-                                "CONFIG RESOURCES (REFERENCE ONLY):\n"
-                                f"Taxonomy:\n{taxonomy_text}\n\n"
-                                f"Severity Rules:\n{severity_text}\n\n"
-                                f"Routing Rules:\n{routing_text}\n\n"
-                                "Now triage the user intake."
-                            )
-                        )
-                    ]
-                ),
-                types.Content(role="user", parts=[types.Part(text=user_prompt)])
-            ]
+async def triage_with_gemini(gemini, mcp_client: Client, system_content, user_prompt: str):
+    history = [
+        system_content,
+        types.Content(role="user", parts=[types.Part(text=user_prompt)])
+    ]
 
-            gemini_tools = [mcp_client.session]
+    gemini_tools = [mcp_client.session]
 
-            print("\n🔵 Starting Gemini + MCP tool execution...")
+    print("\n🔵 Starting Gemini + MCP tool execution...")
 
-            while True:
-                response = await gemini.aio.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=history,
-                    config=types.GenerateContentConfig(tools=gemini_tools)
-                )
+    while True:
+        response_text, parsed, function_calls = await stream_gemini_turn(gemini, history, gemini_tools)
 
-                # ✅ final answer
-                if response.text:
-                    parsed = safe_json_load(response.text)
-
-                    if parsed:
-                        # ----------------------------
-                        # 1) Print JSON (optional)
-                        # ----------------------------
-
-                        # ----------------------------
-                        # 2) Print formatted output
-                        # ----------------------------
-                        print("\n🟢 Final Triage Result (Formatted):\n")
-                        print("====================================")
-                        print(f"📌 Category      : {parsed.get('category')}")
-                        print(f"🔥 Severity      : {parsed.get('severity_level')}")
-                        print(f"📊 Score         : {parsed.get('severity_score')}")
-                        print(f"⚡ Priority      : {parsed.get('priority')}")
-                        print(f"🏥 Destination   : {parsed.get('destination')}")
-                        print(f"📝 Reason        : {parsed.get('reason')}")
-                        print("====================================\n")
-
-                        # ✅ EXTRA: Print what LLM decided (ONLY if needs_llm=True)
-                        if parsed.get("needs_llm") is True:
-                            llm_decision = parsed.get("llm_decision") or {}
-                            print("------------------------------------")
-                            print(f"✅ Selected Category : {llm_decision.get('selected_category')}")
-                            print(f"📝 LLM Reason        : {llm_decision.get('reason')}")
-                            print("------------------------------------\n")
-
-                    else:
-                        print("\n🟢 Final Answer (Raw):")
-                        print(response.text)
-                    break
+        # ✅ final answer
+        if response_text:
+            if parsed:
+                print_triage_result(parsed)
+            else:
+                print("\n🟢 Final Answer (Raw):")
+                print(response_text)
+            break
 
-                # ✅ tool call requested
-                if response.function_calls:
-                    fc = response.function_calls[0]
-                    tool_name = fc.name
-                    tool_args = dict(fc.args)
+        # ✅ tool call requested
+        if function_calls:
+            fc = function_calls[0]
+            tool_name = fc.name
+            tool_args = dict(fc.args)
 
-                    print(f"\n🤖 Gemini calls tool: {tool_name}")
-                    print(f"Args: {tool_args}")
+            print(f"\n🤖 Gemini calls tool: {tool_name}")
+            print(f"Args: {tool_args}")
 
-                    result = await mcp_client.call_tool(tool_name, tool_args)
-                    result_text = result.content[0].text
+            result = await mcp_client.call_tool(tool_name, tool_args)
+            result_text = result.content[0].text
 
-                    print("\n🛠 MCP Tool Output:")
-                    print(result_text)
+            print("\n🛠 MCP Tool Output:")
+            print(result_text)
 
-                    history.append(
-                        types.Content(
-                            role="model",
-                            parts=[types.Part.from_function_call(fc)]
-                        )
-                    )
-
-                    history.append(
-                        types.Content(
-                            role="function",
-                            parts=[
-                                types.Part.from_function_response(
-                                    name=tool_name,
-                                    response={"result": result_text}
-                                )
-                            ]
+            history.append(
+                types.Content(
+                    role="model",
+                    parts=[types.Part.from_function_call(fc)]
+                )
+            )
+
+            history.append(
+                types.Content(
+                    role="function",
+                    parts=[
+                        types.Part.from_function_response(
+                            name=tool_name,
+                            response={"result": result_text}
                         )
-                    )
+                    ]
+                )
+            )
+
+        else:
+            print("\n⚠️ No tool call and no final answer. Stopping.")
+            break
+
+
+async def triage_batch(gemini, mcp_client: Client, system_content, intakes: list):
+    """
+    One triage_intake_batch call for all intakes; only the ones the
+    keyword triage could not settle (needs_llm=true) go through Gemini.
+    """
+    print(f"\n📦 Triaging {len(intakes)} intakes in one batch...")
+
+    result = await mcp_client.call_tool("triage_intake_batch", {"texts": intakes})
+    batch = safe_json_load(result.content[0].text) or {}
+
+    if not batch.get("ok"):
+        print(f"\n❌ Batch triage failed: {batch.get('error')}")
+        return
+
+    for user_prompt, item in zip(intakes, batch.get("results", [])):
+        print(f"\n📨 Intake: {user_prompt}")
+
+        if item.get("ok") and item.get("needs_llm") is False:
+            summary = item.get("triage_summary", {})
+            print_triage_result({
+                "needs_llm": False,
+                "category": summary.get("category"),
+                "severity_level": summary.get("severity_level"),
+                "severity_score": summary.get("severity_score"),
+                "priority": summary.get("priority"),
+                "destination": summary.get("destination"),
+                "reason": summary.get("status")
+            })
+        else:
+            await triage_with_gemini(gemini, mcp_client, system_content, user_prompt)
+
+
+async def main(intake_file: str = None):
+    if intake_file:
+        with open(intake_file, "r") as f:
+            intakes = [line.strip() for line in f if line.strip()]
+    else:
+        intakes = [input("Enter request / intake text: ")]
 
-                else:
-                    print("\n⚠️ No tool call and no final answer. Stopping.")
-                    break
+    try:
+        gemini = get_gemini()
+        mcp_client = Client(REMOTE_SERVER_URL)
+
+        async with mcp_client:
+            await mcp_client.initialize()
+
+            system_content = get_system_content(*await fetch_config_texts(mcp_client))
+
+            if intake_file:
+                await triage_batch(gemini, mcp_client, system_content, intakes)
+            else:
+                await triage_with_gemini(gemini, mcp_client, system_content, intakes[0])
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Intake Triage MCP Client")
+    parser.add_argument("--file", help="text file with one intake per line (batch mode)")
+    args = parser.parse_args()
+
     print("🚀 Starting Intake Triage MCP Client...")
-    asyncio.run(main())
+    asyncio.run(main(args.file))
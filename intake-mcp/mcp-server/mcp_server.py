@@ -1,10 +1,31 @@
 import os
+import asyncio
 import yaml
 import json
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 import re
-from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# optional: compiled multi-keyword matcher (pip install pyahocorasick)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# optional: faster JSON parsing/serialization (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ✅ Hackathon required MCP framework
 from fastmcp import FastMCP
@@ -15,6 +36,54 @@ from starlette.responses import PlainTextResponse
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("IntakeTriageMCP")
 
+
+# --------------------------------------------------
+# JSON (orjson when available, stdlib otherwise)
+# --------------------------------------------------
+def to_json(data: Any) -> str:
+    """
+    Serializes like FastMCP's default (indent=2, UTF-8, str() fallback).
+    """
+
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str)
+
+
+def from_json(raw: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def read_json(path: str) -> Any:
+    with open(path, "rb") as f:
+        return from_json(f.read())
+
+
+def config_int(value: Any, default: int, name: str) -> int:
+    """
+    Casts a numeric config value, logging and falling back to the default
+    on bad input so one typo does not take down every tool and resource.
+    """
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        logger.error(f"Invalid {name}: {value!r}, using {default}")
+        return default
+
+
+# process-lifetime settings, read once at import
+ACTIVE_INDUSTRY = os.getenv("ACTIVE_INDUSTRY", "healthcare")
+CONFIG_PATH = os.getenv("CONFIG_PATH", "")
+
+# inputs longer than this are scanned off the event loop
+LONG_TEXT_THRESHOLD = config_int(os.getenv("LONG_TEXT_THRESHOLD", "4096"), 4096, "LONG_TEXT_THRESHOLD")
+
+# triage results kept per config snapshot (0 disables)
+TRIAGE_CACHE_SIZE = config_int(os.getenv("TRIAGE_CACHE_SIZE", "4096"), 4096, "TRIAGE_CACHE_SIZE")
+
 mcp = FastMCP("Intelligent Intake and Triage MCP Server")
 
 
@@ -34,8 +103,90 @@ async def root(request):
 # --------------------------------------------------
 # Helpers
 # --------------------------------------------------
+_NORM_RE = re.compile(r"[^a-z0-9\s]")
+
+# same mapping as _NORM_RE for ASCII, derived from it so the two never drift
+_NORM_TABLE = str.maketrans({
+    c: " " for c in map(chr, range(128)) if _NORM_RE.match(c)
+})
+
+
 def normalize_text(text: str) -> str:
-    return re.sub(r"[^a-z0-9\s]", " ", text.lower()).strip()
+    if text.isascii():
+        return text.lower().translate(_NORM_TABLE).strip()
+    return _NORM_RE.sub(" ", text.lower()).strip()
+
+
+@lru_cache(maxsize=256)
+def _cached_normalize(text: str) -> str:
+    return normalize_text(text)
+
+
+def _normalize_once(text: str) -> str:
+    """
+    Normalizes user text, memoized so the classify_intake / score_severity
+    calls that follow an LLM-assisted triage of the same text reuse it.
+    Long texts are not kept in the cache.
+    """
+
+    if len(text) > LONG_TEXT_THRESHOLD:
+        return normalize_text(text)
+    return _cached_normalize(text)
+
+
+def severity_levels(rules: Dict[str, Any]) -> List[str]:
+    priority_order = ["critical", "high", "medium", "low"]
+    return [lvl for lvl in priority_order if lvl in rules] + [
+        lvl for lvl in rules.keys() if lvl not in priority_order
+    ]
+
+
+def normalize_keywords(keywords: List[str]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Returns (originals, normalized) as parallel tuples,
+    dropping keywords that normalize to "".
+    """
+
+    originals, normalized = [], []
+    for kw in keywords:
+        kw_norm = normalize_text(kw)
+        if kw_norm:
+            originals.append(kw)
+            normalized.append(kw_norm)
+    return tuple(originals), tuple(normalized)
+
+
+def build_automaton(entries: List[Tuple[str, Any]]) -> Any:
+    """
+    Builds one Aho-Corasick automaton over (normalized keyword, value) pairs.
+    Each keyword maps to the list of values that share it.
+    Returns None when pyahocorasick is not installed.
+    """
+
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for kw_norm, value in entries:
+        if kw_norm in automaton:
+            automaton.get(kw_norm).append(value)
+        else:
+            automaton.add_word(kw_norm, [value])
+
+    if len(automaton) == 0:
+        return None
+
+    automaton.make_automaton()
+    return automaton
+
+
+def automaton_hits(automaton: Any, normalized_text: str) -> List[Any]:
+    """
+    Single pass over the text; each matched keyword is counted once
+    and hits are returned in config order.
+    """
+
+    return sorted({value for _, values in automaton.iter(normalized_text) for value in values})
 
 
 def error_response(message: str, code: int = 400, details: Any = None) -> Dict[str, Any]:
@@ -56,28 +207,42 @@ def error_response(message: str, code: int = 400, details: Any = None) -> Dict[s
 #   severity.yaml
 #   routing.json
 # --------------------------------------------------
-def load_config() -> Dict[str, Any]:
+def config_paths() -> Tuple[str, str, str]:
     """
-    Loads config dynamically using either:
+    Resolves the config folder using either:
     - CONFIG_PATH=/configs/healthcare    (folder path containing 3 files)
     OR
     - ACTIVE_INDUSTRY=healthcare        (loads ./config/healthcare/)
     """
 
-    config_path_env = os.getenv("CONFIG_PATH", "").strip()
+    config_path_env = CONFIG_PATH.strip()
 
     if config_path_env:
         base_path = config_path_env
-        logger.info(f"Loading config folder from CONFIG_PATH: {base_path}")
     else:
-        industry = os.getenv("ACTIVE_INDUSTRY", "healthcare").strip().lower()
+        industry = ACTIVE_INDUSTRY.strip().lower()
         base_dir = os.path.dirname(os.path.abspath(__file__))
         base_path = os.path.join(base_dir, "config", industry)
-        logger.info(f"Loading config for industry='{industry}' from: {base_path}")
 
-    taxonomy_path = os.path.join(base_path, "taxonomy.json")
-    severity_path = os.path.join(base_path, "severity.yaml")
-    routing_path = os.path.join(base_path, "routing.json")
+    return (
+        os.path.join(base_path, "taxonomy.json"),
+        os.path.join(base_path, "severity.yaml"),
+        os.path.join(base_path, "routing.json"),
+    )
+
+
+def baked_severity_path(severity_path: str) -> str:
+    return os.path.splitext(severity_path)[0] + ".json"
+
+
+def load_config() -> Dict[str, Any]:
+    """
+    Reads and parses the 3 config files from disk.
+    Prefer get_config(), which caches the result.
+    """
+
+    taxonomy_path, severity_path, routing_path = config_paths()
+    logger.info(f"Loading config from: {os.path.dirname(taxonomy_path)}")
 
     config: Dict[str, Any] = {
         "taxonomy": [],
@@ -96,8 +261,7 @@ def load_config() -> Dict[str, Any]:
     # -------- TAXONOMY.JSON --------
     if os.path.exists(taxonomy_path):
         try:
-            with open(taxonomy_path, "r") as f:
-                taxonomy_data = json.load(f) or {}
+            taxonomy_data = read_json(taxonomy_path) or {}
             config["taxonomy"] = taxonomy_data.get("taxonomy", [])
         except Exception as e:
             logger.error(f"Failed to load taxonomy.json: {e}")
@@ -105,21 +269,33 @@ def load_config() -> Dict[str, Any]:
         logger.error(f"taxonomy.json not found at: {taxonomy_path}")
 
     # -------- SEVERITY.YAML --------
-    if os.path.exists(severity_path):
+    # a pre-baked severity.json next to it skips the YAML parse;
+    # if it is unreadable, fall back to the YAML
+    severity_loaded = False
+    severity_json_path = baked_severity_path(severity_path)
+    if os.path.exists(severity_json_path):
         try:
-            with open(severity_path, "r") as f:
-                severity_data = yaml.safe_load(f) or {}
+            severity_data = read_json(severity_json_path) or {}
             config["severity_rules"] = severity_data.get("severity_rules", {})
+            severity_loaded = True
         except Exception as e:
-            logger.error(f"Failed to load severity.yaml: {e}")
-    else:
-        logger.error(f"severity.yaml not found at: {severity_path}")
+            logger.error(f"Failed to load severity.json, falling back to severity.yaml: {e}")
+
+    if not severity_loaded:
+        if os.path.exists(severity_path):
+            try:
+                with open(severity_path, "r") as f:
+                    severity_data = yaml.load(f, Loader=YamlLoader) or {}
+                config["severity_rules"] = severity_data.get("severity_rules", {})
+            except Exception as e:
+                logger.error(f"Failed to load severity.yaml: {e}")
+        else:
+            logger.error(f"severity.yaml not found at: {severity_path}")
 
     # -------- ROUTING.JSON --------
     if os.path.exists(routing_path):
         try:
-            with open(routing_path, "r") as f:
-                routing_data = json.load(f) or {}
+            routing_data = read_json(routing_path) or {}
 
             config["routing"]["default_destination"] = routing_data.get(
                 "default_destination", "General_Queue"
@@ -136,57 +312,221 @@ def load_config() -> Dict[str, Any]:
     return config
 
 
+# --------------------------------------------------
+# Compiled Config
+# Static, slotted views of the config for the hot paths
+# --------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class TaxonomyEntry:
+    id: Optional[str]
+    keywords: Tuple[str, ...]
+    keywords_norm: Tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class SeverityRule:
+    level: str
+    score: int
+    keywords: Tuple[str, ...]
+    keywords_norm: Tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    category: Optional[str]
+    threshold: int
+    destination: str
+
+
+@dataclass(frozen=True, slots=True)
+class RoutingTable:
+    default_destination: str
+    min_score: int
+    override_destination: str
+    override_priority: str
+    routes_by_category: Dict[Optional[str], Route]
+
+
+# --------------------------------------------------
+# Config Cache
+# Parsed once, re-parsed only when a file's mtime changes
+# --------------------------------------------------
+_config_cache: Dict[str, Any] = {"signature": None, "config": None}
+
+
+def compile_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Prebuilds the normalized keywords, keyword matchers and routing table
+    used by the tools. Runs once per (re)load, never per request.
+    """
+
+    taxonomy = []
+    taxonomy_entries = []
+    for entry in config.get("taxonomy", []):
+        item = TaxonomyEntry(entry.get("id"), *normalize_keywords(entry.get("keywords", [])))
+        taxonomy.append(item)
+        for kw, kw_norm in zip(item.keywords, item.keywords_norm):
+            taxonomy_entries.append((kw_norm, (len(taxonomy_entries), item.id, kw)))
+
+    # in priority order, so the index in this tuple is the level rank
+    rules = config.get("severity_rules", {})
+    severity = []
+    severity_entries = []
+    for rank, level in enumerate(severity_levels(rules)):
+        rule = rules.get(level, {})
+        score = config_int(rule.get("score", 0), 0, f"severity_rules.{level}.score")
+        item = SeverityRule(level, score, *normalize_keywords(rule.get("keywords", [])))
+        severity.append(item)
+        for kw, kw_norm in zip(item.keywords, item.keywords_norm):
+            severity_entries.append((kw_norm, (rank, len(severity_entries), level, kw)))
+
+    routing = config.get("routing", {})
+    default_destination = routing.get("default_destination", "General_Queue")
+    severity_override = routing.get("severity_override", {})
+    routes_by_category: Dict[Optional[str], Route] = {}
+    for rule in routing.get("routes", []):
+        # first rule for a category wins, like the old linear scan
+        category = rule.get("category")
+        if category not in routes_by_category:
+            routes_by_category[category] = Route(
+                category,
+                config_int(rule.get("threshold", 0), 0, f"routes[{category}].threshold"),
+                rule.get("destination", default_destination)
+            )
+
+    config["_taxonomy"] = tuple(taxonomy)
+    config["_severity"] = tuple(severity)
+    config["_routing"] = RoutingTable(
+        default_destination=default_destination,
+        min_score=config_int(severity_override.get("min_score", 9), 9, "severity_override.min_score"),
+        override_destination=severity_override.get("destination", "High_Priority_Queue"),
+        override_priority=severity_override.get("priority", "HIGH"),
+        routes_by_category=routes_by_category
+    )
+    config["_taxonomy_automaton"] = build_automaton(taxonomy_entries)
+    config["_severity_automaton"] = build_automaton(severity_entries)
+
+    # resources are static per load, serialize them once
+    config["_resource_json"] = {
+        "taxonomy": to_json(config.get("taxonomy", [])),
+        "severity_rules": to_json(config.get("severity_rules", {})),
+        "routing": to_json(config.get("routing", {})),
+    }
+
+    # short content hash so clients can reuse a locally cached copy
+    digest = hashlib.sha256()
+    for payload in config["_resource_json"].values():
+        digest.update(payload.encode())
+    config["_version"] = digest.hexdigest()[:16]
+
+    # triage is deterministic per config, so results are memoized (as JSON)
+    # on the normalized text; a reload builds a new config and drops this cache
+    config["_triage_cache"] = lru_cache(maxsize=TRIAGE_CACHE_SIZE)(
+        lambda normalized: to_json(_triage_core("", config, normalized))
+    )
+    return config
+
+
+def _config_signature(paths: Tuple[str, ...]) -> Tuple[Any, ...]:
+    signature = []
+    for path in paths:
+        try:
+            signature.append((path, os.stat(path).st_mtime))
+        except OSError:
+            signature.append((path, None))
+    return tuple(signature)
+
+
+def get_config() -> Dict[str, Any]:
+    """
+    Returns the cached config, reloading it if any of the
+    3 files (or a baked severity.json) was added, removed or
+    modified since the last load.
+    """
+
+    paths = config_paths()
+    signature = _config_signature(paths + (baked_severity_path(paths[1]),))
+    if _config_cache["config"] is None or _config_cache["signature"] != signature:
+        _config_cache["config"] = compile_config(load_config())
+        _config_cache["signature"] = signature
+    return _config_cache["config"]
+
+
+def reload_config() -> Dict[str, Any]:
+    """
+    Drops the cached config and loads it again from disk.
+    """
+
+    _config_cache["config"] = None
+    return get_config()
+
+
 # --------------------------------------------------
 # MCP Resources (Config Driven)
 # --------------------------------------------------
-@mcp.resource("config://taxonomy")
-def get_taxonomy() -> List[Dict[str, Any]]:
-    return load_config().get("taxonomy", [])
+@mcp.resource("config://taxonomy", mime_type="application/json")
+def get_taxonomy() -> str:
+    return get_config()["_resource_json"]["taxonomy"]
+
+
+@mcp.resource("config://severity_rules", mime_type="application/json")
+def get_severity_rules() -> str:
+    return get_config()["_resource_json"]["severity_rules"]
 
 
-@mcp.resource("config://severity_rules")
-def get_severity_rules() -> Dict[str, Any]:
-    return load_config().get("severity_rules", {})
+@mcp.resource("config://routing", mime_type="application/json")
+def get_routing_resource() -> str:
+    return get_config()["_resource_json"]["routing"]
 
 
-@mcp.resource("config://routing")
-def get_routing_resource() -> Dict[str, Any]:
-    return load_config().get("routing", {})
+@mcp.resource("config://version")
+def get_config_version() -> str:
+    return get_config()["_version"]
 
 
 @mcp.resource("server://active_industry")
 def get_active_industry() -> Dict[str, Any]:
     return {
-        "ACTIVE_INDUSTRY": os.getenv("ACTIVE_INDUSTRY", "healthcare"),
-        "CONFIG_PATH": os.getenv("CONFIG_PATH", ""),
+        "ACTIVE_INDUSTRY": ACTIVE_INDUSTRY,
+        "CONFIG_PATH": CONFIG_PATH,
         "status": "ok"
     }
 
 
 # --------------------------------------------------
-# MCP Tools (Stateless + Config Driven)
+# Triage Core
+# Runs on the cached config and already-normalized text,
+# so one triage normalizes and loads config only once
 # --------------------------------------------------
-@mcp.tool()
-def classify_intake(text: str) -> Dict[str, Any]:
-    if not isinstance(text, str) or not text.strip():
-        return error_response("Invalid input: 'text' must be a non-empty string.", 422)
+def _taxonomy_hits(config: Dict[str, Any], normalized_text: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yields (category, keyword) for every matched keyword, in taxonomy order.
+    """
+
+    automaton = config.get("_taxonomy_automaton")
+    if automaton is not None:
+        for _, category, kw in automaton_hits(automaton, normalized_text):
+            yield category, kw
+        return
 
-    config = load_config()
-    taxonomy = config.get("taxonomy", [])
-    normalized_text = normalize_text(text)
+    for entry in config["_taxonomy"]:
+        for kw, kw_norm in zip(entry.keywords, entry.keywords_norm):
+            if kw_norm in normalized_text:
+                yield entry.id, kw
 
-    scores = defaultdict(int)
-    matched = defaultdict(list)
 
-    for entry in taxonomy:
-        category = entry.get("id")
-        for kw in entry.get("keywords", []):
-            kw_norm = normalize_text(kw)
-            if kw_norm and kw_norm in normalized_text:
-                scores[category] += 1
-                matched[category].append(kw)
+def _classify(config: Dict[str, Any], normalized_text: str) -> Dict[str, Any]:
+    # one pass: per-category counts (a taxonomy may repeat an id, so runs of
+    # the same category are not assumed contiguous) plus one flat hit list
+    counts: Dict[Optional[str], int] = {}
+    hits: List[Tuple[Optional[str], str]] = []
 
-    if not scores:
+    for category, kw in _taxonomy_hits(config, normalized_text):
+        counts[category] = counts.get(category, 0) + 1
+        hits.append((category, kw))
+
+    total = len(hits)
+    if not total:
         return {
             "ok": True,
             "category": None,
@@ -196,45 +536,54 @@ def classify_intake(text: str) -> Dict[str, Any]:
             "needs_llm": True
         }
 
-    best = max(scores, key=scores.get)
-    total = sum(scores.values())
-    confidence = round(scores[best] / total, 2)
+    # ties go to the category hit first, like the old defaultdict order
+    best = max(counts, key=counts.get)
+    confidence = round(counts[best] / total, 2)
 
     return {
         "ok": True,
         "category": best,
         "confidence": confidence,
-        "matched_keywords": matched[best],
+        "matched_keywords": [kw for category, kw in hits if category == best],
         "method": "keyword",
         "needs_llm": confidence < 0.5
     }
 
 
-@mcp.tool()
-def score_severity(text: str, category: Optional[str] = None) -> Dict[str, Any]:
-    if not isinstance(text, str) or not text.strip():
-        return error_response("Invalid input: 'text' must be a non-empty string.", 422)
-
-    config = load_config()
-    rules = config.get("severity_rules", {})
-    normalized = normalize_text(text)
-
-    priority_order = ["critical", "high", "medium", "low"]
-    ordered_levels = [lvl for lvl in priority_order if lvl in rules] + [
-        lvl for lvl in rules.keys() if lvl not in priority_order
-    ]
+def _first_severity_match(config: Dict[str, Any], normalized: str) -> Optional[Tuple[int, str]]:
+    """
+    Returns (level rank, keyword) of the first severity keyword found,
+    checking levels in priority order, or None.
+    """
 
-    for level in ordered_levels:
-        rule = rules.get(level, {})
-        for kw in rule.get("keywords", []):
-            kw_norm = normalize_text(kw)
-            if kw_norm and kw_norm in normalized:
-                return {
-                    "ok": True,
-                    "score": int(rule.get("score", 0)),
-                    "level": level,
-                    "reason": f"Matched keyword: '{kw}'"
-                }
+    automaton = config.get("_severity_automaton")
+    if automaton is not None:
+        hits = automaton_hits(automaton, normalized)
+        if not hits:
+            return None
+        rank, _, _, kw = hits[0]
+        return rank, kw
+
+    for rank, rule in enumerate(config["_severity"]):
+        for kw, kw_norm in zip(rule.keywords, rule.keywords_norm):
+            if kw_norm in normalized:
+                return rank, kw
+    return None
+
+
+def _score_severity(
+    config: Dict[str, Any], normalized: str, category: Optional[str] = None
+) -> Dict[str, Any]:
+    match = _first_severity_match(config, normalized)
+    if match is not None:
+        rank, kw = match
+        rule = config["_severity"][rank]
+        return {
+            "ok": True,
+            "score": rule.score,
+            "level": rule.level,
+            "reason": f"Matched keyword: '{kw}'"
+        }
 
     if category == "emergency":
         return {
@@ -252,69 +601,49 @@ def score_severity(text: str, category: Optional[str] = None) -> Dict[str, Any]:
     }
 
 
-@mcp.tool()
-def route_case(category: Optional[str], score: int) -> Dict[str, Any]:
-    if score is None or not isinstance(score, int):
-        return error_response("Invalid input: 'score' must be an integer.", 422)
-
-    config = load_config()
-    routing = config.get("routing", {})
-    routes = routing.get("routes", [])
-
-    default_destination = routing.get("default_destination", "General_Queue")
-    severity_override = routing.get("severity_override", {})
+def _route(config: Dict[str, Any], category: Optional[str], score: int) -> Dict[str, Any]:
+    routing = config["_routing"]
 
-    min_score = int(severity_override.get("min_score", 9))
-    if score >= min_score:
+    if score >= routing.min_score:
         return {
             "ok": True,
-            "destination": severity_override.get("destination", "High_Priority_Queue"),
-            "priority": severity_override.get("priority", "HIGH"),
+            "destination": routing.override_destination,
+            "priority": routing.override_priority,
             "status": "Severity override"
         }
 
-    for rule in routes:
-        if rule.get("category") == category:
-            threshold = int(rule.get("threshold", 0))
-            destination = rule.get("destination", default_destination)
-
-            if score >= threshold:
-                return {
-                    "ok": True,
-                    "destination": destination,
-                    "priority": "HIGH" if score >= 7 else "NORMAL",
-                    "status": "Routed via routing.json"
-                }
-            else:
-                return {
-                    "ok": True,
-                    "destination": destination,
-                    "priority": "LOW",
-                    "status": "Below threshold"
-                }
+    route = routing.routes_by_category.get(category)
+    if route is not None:
+        if score >= route.threshold:
+            return {
+                "ok": True,
+                "destination": route.destination,
+                "priority": "HIGH" if score >= 7 else "NORMAL",
+                "status": "Routed via routing.json"
+            }
+        else:
+            return {
+                "ok": True,
+                "destination": route.destination,
+                "priority": "LOW",
+                "status": "Below threshold"
+            }
 
     return {
         "ok": True,
-        "destination": default_destination,
+        "destination": routing.default_destination,
         "priority": "LOW",
         "status": "Unknown category fallback"
     }
 
 
-@mcp.tool()
-def triage_intake(text: str) -> Dict[str, Any]:
+def _triage_core(text: str, config: Dict[str, Any], normalized: str) -> Dict[str, Any]:
     """
-    UPDATED:
-    If keyword classifier is weak, return needs_llm=True
-    so client + Gemini can classify intelligently.
+    Classification -> severity -> routing back-to-back,
+    without the per-step validation and config loads of the tools.
     """
 
-    if not isinstance(text, str) or not text.strip():
-        return error_response("Invalid input: 'text' must be a non-empty string.", 422)
-
-    classification = classify_intake(text)
-    if not classification.get("ok", True):
-        return classification
+    classification = _classify(config, normalized)
 
     # ✅ if classifier says needs_llm, stop and return it
     if classification.get("needs_llm") is True:
@@ -327,22 +656,17 @@ def triage_intake(text: str) -> Dict[str, Any]:
 
     category = classification.get("category")
 
-    severity = score_severity(text, category)
-    if not severity.get("ok", True):
-        return severity
-
+    severity = _score_severity(config, normalized, category)
     score = severity.get("score", 2)
 
-    routing = route_case(category, score)
-    if not routing.get("ok", True):
-        return routing
+    routing = _route(config, category, score)
 
     return {
         "ok": True,
         "needs_llm": False,
         "input": text,
-        "active_industry": os.getenv("ACTIVE_INDUSTRY", "healthcare"),
-        "config_path": os.getenv("CONFIG_PATH", ""),
+        "active_industry": ACTIVE_INDUSTRY,
+        "config_path": CONFIG_PATH,
         "triage_summary": {
             "category": category or "general_inquiry",
             "severity_level": severity.get("level"),
@@ -359,6 +683,111 @@ def triage_intake(text: str) -> Dict[str, Any]:
     }
 
 
+async def run_scan(size: int, scan: Callable[[], Any]) -> Any:
+    """
+    Short texts are scanned inline; long ones (size in chars) in the default
+    thread pool so a big intake does not block other sessions on the event loop.
+    """
+
+    if size > LONG_TEXT_THRESHOLD:
+        return await asyncio.get_running_loop().run_in_executor(None, scan)
+    return scan()
+
+
+def _triage_cached(text: str, config: Dict[str, Any], normalized: str) -> Dict[str, Any]:
+    """
+    _triage_core served from the config's result cache; only the echoed
+    input differs between texts that normalize the same. The cache holds
+    JSON, so every hit decodes into fresh objects no caller can share.
+    """
+
+    if len(normalized) > LONG_TEXT_THRESHOLD:
+        return _triage_core(text, config, normalized)
+
+    result = from_json(config["_triage_cache"](normalized))
+    if "input" in result:
+        result["input"] = text
+    return result
+
+
+# --------------------------------------------------
+# MCP Tools (Stateless + Config Driven)
+# Results are returned pre-serialized via to_json (orjson when available)
+# --------------------------------------------------
+@mcp.tool()
+async def classify_intake(text: str) -> str:
+    if not isinstance(text, str) or not text.strip():
+        return to_json(error_response("Invalid input: 'text' must be a non-empty string.", 422))
+
+    config = get_config()
+    return to_json(await run_scan(len(text), lambda: _classify(config, _normalize_once(text))))
+
+
+@mcp.tool()
+async def score_severity(text: str, category: Optional[str] = None) -> str:
+    if not isinstance(text, str) or not text.strip():
+        return to_json(error_response("Invalid input: 'text' must be a non-empty string.", 422))
+
+    config = get_config()
+    return to_json(
+        await run_scan(len(text), lambda: _score_severity(config, _normalize_once(text), category))
+    )
+
+
+@mcp.tool()
+def route_case(category: Optional[str], score: int) -> str:
+    if score is None or not isinstance(score, int):
+        return to_json(error_response("Invalid input: 'score' must be an integer.", 422))
+
+    return to_json(_route(get_config(), category, score))
+
+
+@mcp.tool()
+async def triage_intake(text: str) -> str:
+    """
+    UPDATED:
+    If keyword classifier is weak, return needs_llm=True
+    so client + Gemini can classify intelligently.
+    """
+
+    if not isinstance(text, str) or not text.strip():
+        return to_json(error_response("Invalid input: 'text' must be a non-empty string.", 422))
+
+    config = get_config()
+    return to_json(await run_scan(len(text), lambda: _triage_cached(text, config, _normalize_once(text))))
+
+
+@mcp.tool()
+async def triage_intake_batch(texts: List[str]) -> str:
+    """
+    Triage many intakes in one call, against one config snapshot.
+    Results come back in input order; invalid items get an error envelope.
+    """
+
+    if not isinstance(texts, list) or not texts:
+        return to_json(error_response("Invalid input: 'texts' must be a non-empty list of strings.", 422))
+
+    config = get_config()
+
+    def scan() -> List[Dict[str, Any]]:
+        results = []
+        for text in texts:
+            if not isinstance(text, str) or not text.strip():
+                results.append(error_response("Invalid input: 'text' must be a non-empty string.", 422))
+            else:
+                results.append(_triage_cached(text, config, _normalize_once(text)))
+        return results
+
+    size = sum(len(text) for text in texts if isinstance(text, str))
+    results = await run_scan(size, scan)
+
+    return to_json({
+        "ok": True,
+        "count": len(results),
+        "results": results
+    })
+
+
 # --------------------------------------------------
 # Run MCP Server (HTTP JSON-RPC)
 # --------------------------------------------------